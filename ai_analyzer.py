@@ -1,80 +1,233 @@
 """
 AI Analysis module for ReportAI
-Provides mock analysis data until Anthropic API is properly integrated
+Uses the Anthropic Claude API when configured, with mock data as fallback
 """
 
 import os
+import re
 import json
+import random
+import asyncio
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+
+import anthropic
+import orjson
+
+# Claude often wraps JSON output in a ```json fence
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*\})\s*```', re.DOTALL)
+
+# Opt in to Anthropic's server-side prompt caching so the static
+# instruction block is only processed once per (template, language)
+_PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+# Exact-match cache for completed analyses, keyed by a hash of the request.
+# Repeated /api/generate calls for the same data skip the Claude round-trip.
+_ANALYSIS_CACHE: OrderedDict = OrderedDict()
+_ANALYSIS_CACHE_MAX = 1024
+
+
+@lru_cache(maxsize=64)
+def _static_instruction(template_type: str, language: str) -> str:
+    """
+    Build the static instruction block for Claude
+    Memoized so repeated calls send a byte-identical prefix, which is what
+    lets the server-side prompt cache hit
+    """
+    language_name = "Finnish" if language == "fi" else "English"
+    return (
+        f"You are a quality engineer writing a {template_type} report. "
+        f"Analyze the measurement data summary that follows and respond in {language_name}.\n\n"
+        "Respond with a single JSON object containing exactly these keys:\n"
+        '- "executive_summary": string\n'
+        '- "key_findings": list of strings\n'
+        '- "statistical_analysis": object with "sample_count", "measurement_range", "outliers"\n'
+        '- "recommendations": list of strings\n'
+        '- "conclusion": string'
+    )
+
+
+def _cache_key(data_summary: dict, template_type: str, language: str) -> str:
+    """Stable SHA-256 key over the analysis inputs"""
+    payload = json.dumps(
+        {"t": template_type, "l": language, "s": data_summary},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
 class AIAnalyzer:
     """Handles AI-powered analysis of measurement data"""
-    
+
     def __init__(self):
-        """Initialize with mock data support"""
-        print("INFO: Using mock data for AI analysis (Anthropic API will be integrated later)")
-        self.use_mock = True
-    
-    def analyze_data(self, data_summary: dict, template_type: str = "testing", language: str = "en") -> dict:
+        """Initialize the async Claude client, or fall back to mock data without an API key"""
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if api_key:
+            self.client = anthropic.AsyncAnthropic(api_key=api_key)
+            self.use_mock = False
+            print("INFO: Using Anthropic Claude API for AI analysis")
+        else:
+            self.client = None
+            self.use_mock = True
+            print("INFO: Using mock data for AI analysis (set ANTHROPIC_API_KEY to enable Claude)")
+
+    async def analyze(self, data_summary: dict, template_type: str = "testing", language: str = "en") -> dict:
         """
         Analyze measurement data and generate insights
-        Currently returns mock data - will use Claude API when integrated
-        
+        Awaits the Claude API so the event loop stays free during the round-trip
+
         Args:
             data_summary: Dictionary containing measurement data summary
             template_type: Type of report (testing, quality_control, etc.)
             language: Report language (en or fi)
-            
+
         Returns:
             Dictionary containing analysis results
         """
-        print(f"Generating mock analysis for {template_type} report in {language}")
-        
-        # Return mock analysis data
-        return self._generate_mock_analysis(data_summary, template_type, language)
-    
+        if self.use_mock:
+            print(f"Generating mock analysis for {template_type} report in {language}")
+            return self._generate_mock_analysis(data_summary, template_type, language)
+
+        key = _cache_key(data_summary, template_type, language)
+        if key in _ANALYSIS_CACHE:
+            _ANALYSIS_CACHE.move_to_end(key)
+            return _ANALYSIS_CACHE[key]
+
+        try:
+            response_text = await self._call_with_retry(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=2000,
+                temperature=0.0,
+                top_p=1.0,
+                extra_headers=_PROMPT_CACHING_HEADERS,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": _static_instruction(template_type, language),
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {
+                            "type": "text",
+                            "text": "Data summary:\n" + json.dumps(data_summary, default=str)
+                        }
+                    ]
+                }]
+            )
+            analysis = self._structure_analysis(response_text)
+        except Exception as e:
+            print(f"WARNING: Claude API call failed ({e}), falling back to mock analysis")
+            return self._generate_mock_analysis(data_summary, template_type, language)
+
+        _ANALYSIS_CACHE[key] = analysis
+        if len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_MAX:
+            _ANALYSIS_CACHE.popitem(last=False)
+        return analysis
+
+    async def _call_with_retry(self, **kwargs) -> str:
+        """
+        Stream a completion from the messages API and return its text,
+        retrying transient upstream errors (rate limit, timeout, 5xx) up
+        to 3 attempts with exponential backoff; permanent errors (400,
+        auth) propagate immediately
+        """
+        for attempt in range(3):
+            try:
+                # Streaming starts consuming tokens as they are generated
+                # instead of blocking until the full response is complete
+                async with self.client.messages.stream(**kwargs) as stream:
+                    chunks = []
+                    async for chunk in stream.text_stream:
+                        chunks.append(chunk)
+                    return "".join(chunks)
+            except (anthropic.RateLimitError,
+                    anthropic.APITimeoutError,
+                    anthropic.InternalServerError) as e:
+                # No backoff after the final attempt; fail straight away
+                if attempt == 2:
+                    raise
+                delay = (2 ** attempt) * 0.5 + random.random() * 0.1
+                print(f"WARNING: Transient Claude API error ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _structure_analysis(self, analysis_text: str) -> dict:
+        """Parse Claude's response text into the analysis dictionary"""
+
+        text = analysis_text.strip()
+        fenced = _JSON_FENCE_RE.search(text)
+        if fenced:
+            text = fenced.group(1)
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            # Last resort: prose around a bare JSON object
+            start = text.find('{')
+            end = text.rfind('}')
+            if start != -1 and end > start:
+                return orjson.loads(text[start:end + 1])
+            print(f"WARNING: Analysis response is not valid JSON: {e}")
+            raise
+
     def _generate_mock_analysis(self, data_summary: dict, template_type: str, language: str) -> dict:
-        """Generate mock analysis data"""
-        
-        if language == "fi":
-            return {
-                "executive_summary": f"Tämä on esimerkkiraportti {template_type}-tyyppiselle analyysille. "
-                                   "Mittausdatasta löytyi useita mielenkiintoisia havaintoja.",
-                "key_findings": [
-                    "Mittausarvot ovat pääosin odotusten mukaisia",
-                    "Havaittu pieni vaihtelu eri mittauspisteissä",
-                    "Laadunvalvontarajat täyttyvät kaikissa tapauksissa"
-                ],
-                "statistical_analysis": {
-                    "sample_count": data_summary.get("total_rows", "N/A"),
-                    "measurement_range": "Vaihteluväli on normaali",
-                    "outliers": "Ei merkittäviä poikkeamia havaittu"
-                },
-                "recommendations": [
-                    "Jatka mittauksia nykyisellä metodologialla",
-                    "Dokumentoi kaikki poikkeamat",
-                    "Tarkista kalibrointi säännöllisesti"
-                ],
-                "conclusion": "Mittaustulokset ovat luotettavia ja vastaavat laadullisia vaatimuksia."
-            }
-        else:
-            return {
-                "executive_summary": f"This is a sample report for {template_type} analysis. "
-                                   "The measurement data reveals several interesting observations.",
-                "key_findings": [
-                    "Measurement values are generally within expected ranges",
-                    "Minor variations observed across different measurement points",
-                    "All quality control limits are met"
-                ],
-                "statistical_analysis": {
-                    "sample_count": data_summary.get("total_rows", "N/A"),
-                    "measurement_range": "Variation within normal limits",
-                    "outliers": "No significant outliers detected"
-                },
-                "recommendations": [
-                    "Continue measurements with current methodology",
-                    "Document all deviations systematically",
-                    "Verify calibration on regular basis"
-                ],
-                "conclusion": "The measurement results are reliable and meet quality requirements."
+        """Generate mock analysis data from the frozen module-level templates"""
+
+        tmpl = _MOCK_TEMPLATES["fi" if language == "fi" else "en"]
+        return {
+            **tmpl,
+            "executive_summary": tmpl["executive_summary"].format(template_type=template_type),
+            "statistical_analysis": {
+                **tmpl["statistical_analysis"],
+                "sample_count": data_summary.get("total_rows", "N/A")
             }
+        }
+
+
+# Mock analysis templates; only executive_summary's template type and
+# statistical_analysis's sample_count vary per request, so the rest is
+# shared instead of rebuilt on every call
+_MOCK_TEMPLATES = {
+    "fi": {
+        "executive_summary": "Tämä on esimerkkiraportti {template_type}-tyyppiselle analyysille. "
+                             "Mittausdatasta löytyi useita mielenkiintoisia havaintoja.",
+        "key_findings": [
+            "Mittausarvot ovat pääosin odotusten mukaisia",
+            "Havaittu pieni vaihtelu eri mittauspisteissä",
+            "Laadunvalvontarajat täyttyvät kaikissa tapauksissa"
+        ],
+        "statistical_analysis": {
+            "sample_count": "N/A",
+            "measurement_range": "Vaihteluväli on normaali",
+            "outliers": "Ei merkittäviä poikkeamia havaittu"
+        },
+        "recommendations": [
+            "Jatka mittauksia nykyisellä metodologialla",
+            "Dokumentoi kaikki poikkeamat",
+            "Tarkista kalibrointi säännöllisesti"
+        ],
+        "conclusion": "Mittaustulokset ovat luotettavia ja vastaavat laadullisia vaatimuksia."
+    },
+    "en": {
+        "executive_summary": "This is a sample report for {template_type} analysis. "
+                             "The measurement data reveals several interesting observations.",
+        "key_findings": [
+            "Measurement values are generally within expected ranges",
+            "Minor variations observed across different measurement points",
+            "All quality control limits are met"
+        ],
+        "statistical_analysis": {
+            "sample_count": "N/A",
+            "measurement_range": "Variation within normal limits",
+            "outliers": "No significant outliers detected"
+        },
+        "recommendations": [
+            "Continue measurements with current methodology",
+            "Document all deviations systematically",
+            "Verify calibration on regular basis"
+        ],
+        "conclusion": "The measurement results are reliable and meet quality requirements."
+    }
+}
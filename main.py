@@ -3,19 +3,25 @@ ReportAI Backend API
 FastAPI application for automated quality report generation
 """
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, Request, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
 import json
 import uuid
-import shutil
+import asyncio
+import aiofiles
+import blake3
 from datetime import datetime
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import openpyxl
+from python_calamine import CalamineWorkbook
 
 # Import custom modules
+import stats
 from ai_analyzer import AIAnalyzer
 from report_generator import ReportGenerator
 
@@ -23,7 +29,8 @@ from report_generator import ReportGenerator
 app = FastAPI(
     title="ReportAI API",
     description="Automated quality report generation with AI",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration - CRITICAL for frontend communication
@@ -40,6 +47,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject uploads above this size before they can exhaust worker memory/disk
+MAX_UPLOAD = int(os.getenv("MAX_UPLOAD_MB", "100")) * 1024 * 1024
+
 # Create necessary directories
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
@@ -53,10 +63,163 @@ app.mount("/downloads", StaticFiles(directory=str(OUTPUT_DIR)), name="downloads"
 ai_analyzer = AIAnalyzer()
 report_generator = ReportGenerator()
 
-# In-memory storage for file metadata
+# Per-worker cache of file metadata; the JSON sidecar next to each
+# upload is the source of truth so all uvicorn workers see every file
 file_store = {}
 
 
+def _meta_path(file_id: str) -> Path:
+    return UPLOAD_DIR / f"{file_id}.json"
+
+
+def _save_file_info(file_id: str, info: dict):
+    """Persist upload metadata so every worker can serve this file_id"""
+    file_store[file_id] = info
+    # default=str covers date/datetime preview cells that json can't encode
+    _meta_path(file_id).write_text(json.dumps(info, default=str))
+
+
+def _get_file_info(file_id: str):
+    """Look up upload metadata, falling back to the on-disk sidecar"""
+    info = file_store.get(file_id)
+    if info is None:
+        meta_path = _meta_path(file_id)
+        if meta_path.exists():
+            info = json.loads(meta_path.read_text())
+            file_store[file_id] = info
+    # Another worker may have cleaned this upload up; the file on disk is
+    # the source of truth, so drop stale entries and report not-found
+    if info is not None and not Path(info["filepath"]).exists():
+        file_store.pop(file_id, None)
+        data_cache.pop(file_id, None)
+        return None
+    return info
+
+# Cache of parsed data keyed by file_id so later endpoints reuse the
+# DataFrame/workbook instead of re-reading the file from disk
+data_cache = {}
+
+
+def _cache_dataframe(file_id: str, file_path: str, df: pd.DataFrame):
+    """Store a parsed DataFrame for reuse by later endpoints"""
+    data_cache[file_id] = {
+        "df": df,
+        "mtime": Path(file_path).stat().st_mtime,
+        # Heavy summaries are computed lazily on first use
+        "describe": None,
+        "head10": None
+    }
+
+
+def _get_dataframe(file_id: str, file_path: str) -> pd.DataFrame:
+    """Return the cached DataFrame, re-parsing only if the file changed on disk"""
+    entry = data_cache.get(file_id)
+    mtime = Path(file_path).stat().st_mtime
+    if entry is not None and entry["mtime"] == mtime:
+        return entry["df"]
+    if file_path.endswith('.csv'):
+        df = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+    else:
+        df = pd.read_excel(file_path, engine='calamine')
+    _cache_dataframe(file_id, file_path, df)
+    return df
+
+
+def _records(head: pd.DataFrame) -> list:
+    """
+    Build row records from column arrays
+    .tolist() hits the ndarray fast path, skipping to_dict's per-row loop
+    """
+    cols = head.columns.tolist()
+    arrs = [head[c].tolist() for c in cols]
+    # pd.NA (pyarrow-backed columns) is not JSON-serializable; map all
+    # missing values to None, same as _describe does
+    return [
+        {c: None if pd.isna(v := arrs[j][i]) else v for j, c in enumerate(cols)}
+        for i in range(len(head))
+    ]
+
+
+def _describe(df: pd.DataFrame) -> dict:
+    """Describe a DataFrame, using the Numba kernel for large numeric frames"""
+    if len(df) == 0:
+        return {}
+    if len(df) >= stats.LARGE_FRAME_ROWS:
+        numeric = df.select_dtypes(include='number')
+        if not numeric.empty:
+            return stats.describe_numeric(numeric)
+    # Convert to plain primitives in one pass so serialization never
+    # round-trips through nested pandas Series
+    return {
+        str(col): {
+            k: None if pd.isna(v)
+            else float(v) if isinstance(v, (int, float, np.integer, np.floating))
+            else v
+            for k, v in series.items()
+        }
+        for col, series in df.describe().items()
+    }
+
+
+def _get_describe(file_id: str, df: pd.DataFrame) -> dict:
+    """Return df.describe() as a dict, computed at most once per cached file"""
+    entry = data_cache.get(file_id)
+    if entry is None:
+        return _describe(df)
+    if entry["describe"] is None:
+        entry["describe"] = _describe(df)
+    return entry["describe"]
+
+
+def _get_head10(file_id: str, df: pd.DataFrame) -> list:
+    """Return the first 10 rows as records, computed at most once per cached file"""
+    entry = data_cache.get(file_id)
+    if entry is None:
+        return _records(df.head(10))
+    if entry["head10"] is None:
+        entry["head10"] = _records(df.head(10))
+    return entry["head10"]
+
+
+def _build_data_summary(file_id: str, df: pd.DataFrame) -> dict:
+    """
+    Build the lightweight summary dict consumed by the AI analyzer
+    Computed once per request so the analyzer never rescans the DataFrame
+    """
+    numeric = df.select_dtypes(include='number')
+    numeric_stats = {}
+    if not numeric.empty:
+        # Single C-level pass over one contiguous buffer instead of two
+        # column-wise pandas reductions
+        arr = numeric.to_numpy(dtype='float64')
+        numeric_stats = {
+            "mean": float(np.nanmean(arr)),
+            "std": float(np.nanstd(arr))
+        }
+    return {
+        "total_rows": len(df),
+        "total_columns": len(df.columns),
+        "columns": df.columns.tolist(),
+        "sample_data": _get_head10(file_id, df),
+        "statistics": _get_describe(file_id, df),
+        "numeric_stats": numeric_stats
+    }
+
+
+def _get_workbook(file_path: str):
+    """
+    Load a fresh openpyxl workbook for .xlsx uploads
+    Loaded per request rather than cached: the Excel builder mutates the
+    workbook (drops and rebuilds the report sheets), so a shared instance
+    would race between concurrent generates for the same file
+    """
+    # openpyxl cannot read legacy .xls; the Excel builder falls back to a
+    # fresh workbook when None is returned
+    if not file_path.endswith('.xlsx'):
+        return None
+    return openpyxl.load_workbook(file_path)
+
+
 @app.get("/")
 async def root():
     """Root endpoint - health check"""
@@ -81,7 +244,7 @@ async def health_check():
 
 
 @app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(request: Request, file: UploadFile = File(...)):
     """
     Upload and process data file (Excel or CSV)
     Returns file ID and preview of data
@@ -93,43 +256,68 @@ async def upload_file(file: UploadFile = File(...)):
                 status_code=400,
                 detail="Invalid file type. Please upload Excel (.xlsx, .xls) or CSV file"
             )
-        
-        # Generate unique file ID
-        file_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{file_id}_{file.filename}"
-        
-        # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+
+        # Reject oversized uploads before reading the body when the
+        # client declares its size
+        content_length = request.headers.get("content-length")
+        if content_length and int(content_length) > MAX_UPLOAD:
+            raise HTTPException(status_code=413, detail="File too large")
+
+        # Stream the upload to a temp file in chunks, hashing as we go so
+        # the content digest can serve as the file ID
+        tmp_path = UPLOAD_DIR / f"tmp_{uuid.uuid4()}"
+        hasher = blake3.blake3()
+        total = 0
+        too_large = False
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while chunk := await file.read(1 << 20):
+                total += len(chunk)
+                if total > MAX_UPLOAD:
+                    too_large = True
+                    break
+                hasher.update(chunk)
+                await out.write(chunk)
+        if too_large:
+            tmp_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=413, detail="File too large")
+
+        # Content-addressed storage: identical re-uploads map to the same
+        # file_id, deduplicating storage and reusing cached analyses
+        file_id = hasher.hexdigest()[:16]
+        file_path = UPLOAD_DIR / f"{file_id}{Path(file.filename).suffix}"
+        if file_path.exists():
+            tmp_path.unlink()
+        else:
+            tmp_path.rename(file_path)
         
         # Read and preview data
         if file.filename.endswith('.csv'):
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+            sheet_names = ["Data"]
         else:
-            df = pd.read_excel(file_path, sheet_name=None)
-            # If multiple sheets, use first sheet
-            if isinstance(df, dict):
-                sheet_names = list(df.keys())
-                df = df[sheet_names[0]]
-            else:
-                sheet_names = ["Sheet1"]
-        
+            # List sheets without materializing cells, then parse only the first one
+            sheet_names = CalamineWorkbook.from_path(str(file_path)).sheet_names
+            df = pd.read_excel(file_path, engine='calamine', sheet_name=sheet_names[0])
+
         # Create preview
         preview = {
-            "sheets": sheet_names if file.filename.endswith(('.xlsx', '.xls')) else ["Data"],
+            "sheets": sheet_names,
             "rows": len(df),
             "columns": len(df.columns),
             "column_names": df.columns.tolist(),
-            "first_rows": df.head(5).to_dict('records')
+            "first_rows": _records(df.head(5))
         }
         
+        # Cache the parsed DataFrame for /api/generate
+        _cache_dataframe(file_id, str(file_path), df)
+
         # Store file metadata
-        file_store[file_id] = {
+        _save_file_info(file_id, {
             "filename": file.filename,
             "filepath": str(file_path),
             "uploaded_at": datetime.now().isoformat(),
             "preview": preview
-        }
+        })
         
         return {
             "success": True,
@@ -137,7 +325,9 @@ async def upload_file(file: UploadFile = File(...)):
             "filename": file.filename,
             "preview": preview
         }
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
@@ -158,34 +348,33 @@ async def generate_report(
     """
     try:
         # Validate file_id
-        if file_id not in file_store:
+        file_info = _get_file_info(file_id)
+        if file_info is None:
             raise HTTPException(status_code=404, detail="File not found")
-        
-        file_info = file_store[file_id]
+
         file_path = file_info["filepath"]
-        
-        # Read data
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
-        
+
+        if output_format not in ("pdf", "word", "excel", "all"):
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {output_format}")
+
+        # Reuse the DataFrame parsed at upload time
+        df = _get_dataframe(file_id, file_path)
+
         # Prepare data summary for AI analysis
-        data_summary = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns": df.columns.tolist(),
-            "sample_data": df.head(10).to_dict('records'),
-            "statistics": df.describe().to_dict() if len(df) > 0 else {}
-        }
-        
-        # Get AI analysis
-        analysis = ai_analyzer.analyze_data(
+        data_summary = _build_data_summary(file_id, df)
+
+        # Kick off the AI analysis, then do analysis-independent prep
+        # (workbook load for Excel output) while the LLM call is in flight
+        analysis_task = asyncio.create_task(ai_analyzer.analyze(
             data_summary=data_summary,
             template_type=template_type,
             language=language
-        )
-        
+        ))
+        workbook = None
+        if output_format in ("excel", "all"):
+            workbook = await asyncio.to_thread(_get_workbook, file_path)
+        analysis = await analysis_task
+
         # Prepare report data
         report_data = {
             "title": report_title,
@@ -198,26 +387,29 @@ async def generate_report(
             "analysis": analysis
         }
         
-        # Generate report
-        output_filename = f"report_{file_id}.{output_format}"
-        output_path = OUTPUT_DIR / output_filename
-        
-        if output_format == "pdf":
-            report_generator.generate_pdf(report_data, str(output_path))
-        elif output_format == "word":
-            report_generator.generate_docx(report_data, str(output_path))
-        elif output_format == "excel":
-            report_generator.generate_xlsx(report_data, str(output_path))
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported format: {output_format}")
-        
+        # Generate report(s); "all" fans the three formats out concurrently
+        if output_format == "all":
+            outputs = await report_generator.generate_all(df, workbook, report_data)
+            return {
+                "success": True,
+                "files": {
+                    fmt: {"filename": path.name, "download_url": f"/downloads/{path.name}"}
+                    for fmt, path in outputs.items()
+                },
+                "format": "all"
+            }
+
+        output_path = await report_generator.generate(df, workbook, report_data, output_format)
+
         return {
             "success": True,
-            "filename": output_filename,
-            "download_url": f"/downloads/{output_filename}",
+            "filename": output_path.name,
+            "download_url": f"/downloads/{output_path.name}",
             "format": output_format
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
 
@@ -226,23 +418,35 @@ async def generate_report(
 async def cleanup_files(file_id: str):
     """Clean up uploaded file and generated reports"""
     try:
-        if file_id in file_store:
-            # Remove uploaded file
-            file_path = Path(file_store[file_id]["filepath"])
-            if file_path.exists():
-                file_path.unlink()
-            
-            # Remove from store
-            del file_store[file_id]
-            
-            return {"success": True, "message": "Files cleaned up"}
-        else:
+        file_info = _get_file_info(file_id)
+        if file_info is None:
             raise HTTPException(status_code=404, detail="File not found")
+
+        # Remove uploaded file and its metadata sidecar
+        file_path = Path(file_info["filepath"])
+        if file_path.exists():
+            file_path.unlink()
+        _meta_path(file_id).unlink(missing_ok=True)
+
+        # Remove from store and drop cached parse results
+        file_store.pop(file_id, None)
+        data_cache.pop(file_id, None)
+
+        return {"success": True, "message": "Files cleaned up"}
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "2")),
+        loop="uvloop",
+        http="httptools"
+    )
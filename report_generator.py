@@ -2,12 +2,18 @@
 Report Generator - Creates PDF, Word, and Excel reports
 """
 
+import io
 import os
+import asyncio
+import cProfile
+import resource
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
+from xml.sax.saxutils import escape
 import pandas as pd
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 
 # PDF generation
 from reportlab.lib import colors
@@ -17,6 +23,55 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
+# Created once at import time so instantiating ReportGenerator never
+# costs a stat/mkdir syscall
+_OUTPUT_DIR = Path("outputs")
+_OUTPUT_DIR.mkdir(exist_ok=True)
+
+# With REPORTAI_PROFILE=1 every builder run dumps a cProfile .prof into
+# outputs/profile/ (inspect with snakeviz) and logs peak RSS, so
+# optimization work is measurement-driven rather than guess-driven
+_PROFILE_ENABLED = os.getenv("REPORTAI_PROFILE") == "1"
+_PROFILE_DIR = _OUTPUT_DIR / "profile"
+
+
+def _profiled(func):
+    """Wrap a report builder with profiling when REPORTAI_PROFILE=1"""
+    if not _PROFILE_ENABLED:
+        return func
+
+    def wrapper(*args, **kwargs):
+        _PROFILE_DIR.mkdir(exist_ok=True)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            prof_path = _PROFILE_DIR / f"{func.__name__}_{stamp}.prof"
+            profiler.dump_stats(str(prof_path))
+            # ru_maxrss is in KiB on Linux
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            print(f"PROFILE: {func.__name__} -> {prof_path} (peak RSS {peak_rss // 1024} MB)")
+    return wrapper
+
+
+# Supported output formats and their file extensions
+_EXTENSIONS = {
+    "pdf": "pdf",
+    "word": "docx",
+    "excel": "xlsx"
+}
+
+# Map filesystem-unsafe characters to underscores in one C-level pass
+_FN_TRANSLATE = str.maketrans({c: '_' for c in ' /\\:*?"<>|\t\n\r'})
+
+# openpyxl styles are immutable; construct them once instead of per report
+_TITLE_FONT = openpyxl.styles.Font(size=18, bold=True)
+_SECTION_FONT = openpyxl.styles.Font(size=14, bold=True)
+_HEADER_FONT = openpyxl.styles.Font(bold=True)
+_HEADER_FILL = openpyxl.styles.PatternFill(start_color="00FF88", end_color="00FF88", fill_type="solid")
+_WRAP_ALIGNMENT = openpyxl.styles.Alignment(wrap_text=True)
+
 # Word generation
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
@@ -24,9 +79,57 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 
 class ReportGenerator:
+    # ReportLab styles are immutable configuration; build them once at
+    # import time instead of per PDF
+    _STYLES = getSampleStyleSheet()
+
+    _TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=_STYLES['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#00ff88'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+
+    _HEADING_STYLE = ParagraphStyle(
+        'CustomHeading',
+        parent=_STYLES['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#00ff88'),
+        spaceAfter=12
+    )
+
+    _FOOTER_STYLE = ParagraphStyle(
+        'Footer',
+        parent=_STYLES['Normal'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    )
+
+    _META_TABLE_STYLE = TableStyle([
+        ('FONT', (0, 0), (-1, -1), 'Helvetica', 10),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.grey),
+        ('TEXTCOLOR', (1, 0), (1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+    _DATA_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#00ff88')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0a0f1a')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ])
+
     def __init__(self):
-        self.output_dir = Path("outputs")
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir = _OUTPUT_DIR
     
     async def generate(
         self,
@@ -48,38 +151,88 @@ class ReportGenerator:
             Path to generated report file
         """
         
+        # Reject unsupported formats before any filename/path work
+        if output_format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported format: {output_format}")
+
+        # Capture the timestamp once; the filename, metadata rows and
+        # footers all share the same instant
+        now = datetime.now()
+
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_title = config['title'].replace(' ', '_').replace('/', '_')
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        safe_title = config['title'].translate(_FN_TRANSLATE)
         filename = f"{safe_title}_{timestamp}.{self._get_extension(output_format)}"
         output_path = self.output_dir / filename
         
-        # Generate based on format
+        # Generate based on format; the builders are CPU-bound, so run
+        # them on the thread pool instead of blocking the event loop
         if output_format == "pdf":
-            self._generate_pdf(data, config, output_path)
+            await asyncio.to_thread(_profiled(self._generate_pdf), data, config, output_path, now)
         elif output_format == "word":
-            self._generate_word(data, config, output_path)
+            await asyncio.to_thread(_profiled(self._generate_word), data, config, output_path, now)
         elif output_format == "excel":
-            self._generate_excel(data, workbook, config, output_path)
-        else:
-            raise ValueError(f"Unsupported format: {output_format}")
+            await asyncio.to_thread(_profiled(self._generate_excel), data, workbook, config, output_path)
         
         return output_path
     
+    async def generate_all(
+        self,
+        data: pd.DataFrame,
+        workbook: Optional[openpyxl.Workbook],
+        config: Dict[str, Any]
+    ) -> Dict[str, Path]:
+        """
+        Generate the report in every supported format concurrently
+
+        The builders share no mutable state and each writes its own file,
+        so they fan out to the thread pool and wall time is roughly
+        max(format_times) instead of their sum.
+
+        Returns:
+            Mapping of output format to generated report path
+        """
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        safe_title = config['title'].translate(_FN_TRANSLATE)
+        paths = {
+            fmt: self.output_dir / f"{safe_title}_{timestamp}.{self._get_extension(fmt)}"
+            for fmt in ("pdf", "word", "excel")
+        }
+
+        await asyncio.gather(
+            asyncio.to_thread(_profiled(self._generate_pdf), data, config, paths["pdf"], now),
+            asyncio.to_thread(_profiled(self._generate_word), data, config, paths["word"], now),
+            asyncio.to_thread(_profiled(self._generate_excel), data, workbook, config, paths["excel"])
+        )
+        return paths
+
     def _get_extension(self, format: str) -> str:
         """Get file extension for format"""
-        extensions = {
-            "pdf": "pdf",
-            "word": "docx",
-            "excel": "xlsx"
-        }
-        return extensions.get(format, "pdf")
+        return _EXTENSIONS.get(format, "pdf")
+
+    @staticmethod
+    def _stat_lines(stat_analysis) -> list:
+        """
+        Flatten the statistical_analysis value into display lines
+        The analysis schema (and the mock templates) deliver a dict of
+        named statistics; plain strings pass through as a single line
+        """
+        if isinstance(stat_analysis, dict):
+            return [
+                f"{str(key).replace('_', ' ').title()}: {value}"
+                for key, value in stat_analysis.items()
+            ]
+        return [str(stat_analysis)]
     
-    def _generate_pdf(self, data: pd.DataFrame, config: Dict[str, Any], output_path: Path):
+    def _generate_pdf(self, data: pd.DataFrame, config: Dict[str, Any], output_path: Path, now: datetime):
         """Generate PDF report"""
         
+        # Build into memory and write the file in one shot, so an
+        # exception mid-layout never leaves a half-written report behind
+        buf = io.BytesIO()
         doc = SimpleDocTemplate(
-            str(output_path),
+            buf,
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
@@ -89,142 +242,113 @@ class ReportGenerator:
         
         # Container for elements
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#00ff88'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#00ff88'),
-            spaceAfter=12
-        )
-        
-        # Title
-        title = Paragraph(config['title'], title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 12))
-        
-        # Metadata table
+        styles = self._STYLES
+        heading_style = self._HEADING_STYLE
+
+        # Title and metadata table
         metadata = [
             ['Date:', config['date']],
             ['Company:', config.get('company', 'N/A')],
             ['Author:', config.get('author', 'N/A')],
-            ['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M')]
+            ['Generated:', now.strftime('%Y-%m-%d %H:%M')]
         ]
-        
         meta_table = Table(metadata, colWidths=[2*inch, 4*inch])
-        meta_table.setStyle(TableStyle([
-            ('FONT', (0, 0), (-1, -1), 'Helvetica', 10),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.grey),
-            ('TEXTCOLOR', (1, 0), (1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 20))
-        
+        meta_table.setStyle(self._META_TABLE_STYLE)
+        elements.extend([
+            Paragraph(config['title'], self._TITLE_STYLE),
+            Spacer(1, 12),
+            meta_table,
+            Spacer(1, 20)
+        ])
+
         # Executive Summary
         analysis = config.get('analysis', {})
-        
-        elements.append(Paragraph('Executive Summary', heading_style))
-        elements.append(Spacer(1, 12))
-        summary_text = analysis.get('executive_summary', 'No summary available')
-        elements.append(Paragraph(summary_text, styles['BodyText']))
-        elements.append(Spacer(1, 20))
-        
+
+        elements.extend([
+            Paragraph('Executive Summary', heading_style),
+            Spacer(1, 12),
+            Paragraph(analysis.get('executive_summary', 'No summary available'), styles['BodyText']),
+            Spacer(1, 20)
+        ])
+
         # Key Findings
-        elements.append(Paragraph('Key Findings', heading_style))
-        elements.append(Spacer(1, 12))
+        elements.extend([Paragraph('Key Findings', heading_style), Spacer(1, 12)])
         findings = analysis.get('key_findings', [])
-        for i, finding in enumerate(findings, 1):
-            elements.append(Paragraph(f"{i}. {finding}", styles['BodyText']))
-            elements.append(Spacer(1, 6))
+        if findings:
+            # One flowable for the whole list; ReportLab lays out each
+            # flowable separately, so N paragraphs mean N layout passes
+            findings_html = "<br/><br/>".join(
+                f"{i}. {escape(finding)}" for i, finding in enumerate(findings, 1)
+            )
+            elements.append(Paragraph(findings_html, styles['BodyText']))
         elements.append(Spacer(1, 20))
-        
+
         # Statistical Analysis
-        elements.append(Paragraph('Statistical Analysis', heading_style))
-        elements.append(Spacer(1, 12))
-        stat_analysis = analysis.get('statistical_analysis', 'No statistical analysis available')
-        elements.append(Paragraph(stat_analysis, styles['BodyText']))
-        elements.append(Spacer(1, 20))
-        
+        stat_lines = self._stat_lines(analysis.get('statistical_analysis', 'No statistical analysis available'))
+        elements.extend([
+            Paragraph('Statistical Analysis', heading_style),
+            Spacer(1, 12),
+            Paragraph("<br/>".join(escape(line) for line in stat_lines), styles['BodyText']),
+            Spacer(1, 20)
+        ])
+
         # Data Summary Table
-        elements.append(Paragraph('Data Summary', heading_style))
-        elements.append(Spacer(1, 12))
-        
-        # Show first few rows of data
-        sample_data = data.head(10)
-        table_data = [sample_data.columns.tolist()] + sample_data.values.tolist()
-        
-        # Limit columns if too many
-        if len(table_data[0]) > 6:
-            table_data = [row[:6] for row in table_data]
-        
-        data_table = Table(table_data)
-        data_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#00ff88')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0a0f1a')),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
-        elements.append(data_table)
-        elements.append(Spacer(1, 20))
-        
+        elements.extend([Paragraph('Data Summary', heading_style), Spacer(1, 12)])
+
+        # Show first few rows of data; slice rows and columns up front so
+        # only the rendered window is ever materialized
+        sample_data = data.iloc[:10, :min(6, data.shape[1])]
+        # to_numpy(copy=False) skips the dtype-consolidation copy that the
+        # legacy .values accessor forces on mixed-dtype frames
+        table_data = [sample_data.columns.tolist()] + sample_data.to_numpy(copy=False).tolist()
+
+        # Explicit equal column widths over the usable page width skip
+        # ReportLab's content-based auto-width measurement entirely
+        usable_width = A4[0] - 72 - 72
+        ncols = len(table_data[0])
+        col_widths = [usable_width / ncols] * ncols
+
+        data_table = Table(table_data, colWidths=col_widths, repeatRows=1, splitByRow=1)
+        data_table.setStyle(self._DATA_TABLE_STYLE)
+        elements.extend([data_table, Spacer(1, 20)])
+
         # Recommendations
-        elements.append(PageBreak())
-        elements.append(Paragraph('Recommendations', heading_style))
-        elements.append(Spacer(1, 12))
+        elements.extend([PageBreak(), Paragraph('Recommendations', heading_style), Spacer(1, 12)])
         recommendations = analysis.get('recommendations', [])
-        for i, rec in enumerate(recommendations, 1):
-            elements.append(Paragraph(f"{i}. {rec}", styles['BodyText']))
-            elements.append(Spacer(1, 6))
+        if recommendations:
+            recommendations_html = "<br/><br/>".join(
+                f"{i}. {escape(rec)}" for i, rec in enumerate(recommendations, 1)
+            )
+            elements.append(Paragraph(recommendations_html, styles['BodyText']))
         elements.append(Spacer(1, 20))
-        
-        # Conclusion
-        elements.append(Paragraph('Conclusion', heading_style))
-        elements.append(Spacer(1, 12))
-        conclusion = analysis.get('conclusion', 'No conclusion available')
-        elements.append(Paragraph(conclusion, styles['BodyText']))
-        
-        # Footer
-        elements.append(Spacer(1, 40))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
-        footer_text = f"Generated by ReportAI - Automated Quality Reports | {datetime.now().strftime('%Y-%m-%d')}"
-        elements.append(Paragraph(footer_text, footer_style))
+
+        # Conclusion and footer
+        footer_text = f"Generated by ReportAI - Automated Quality Reports | {now.strftime('%Y-%m-%d')}"
+        elements.extend([
+            Paragraph('Conclusion', heading_style),
+            Spacer(1, 12),
+            Paragraph(analysis.get('conclusion', 'No conclusion available'), styles['BodyText']),
+            Spacer(1, 40),
+            Paragraph(footer_text, self._FOOTER_STYLE)
+        ])
         
         # Build PDF
         doc.build(elements)
+        output_path.write_bytes(buf.getvalue())
     
-    def _generate_word(self, data: pd.DataFrame, config: Dict[str, Any], output_path: Path):
+    def _generate_word(self, data: pd.DataFrame, config: Dict[str, Any], output_path: Path, now: datetime):
         """Generate Word (DOCX) report"""
         
         doc = Document()
-        
+
+        # Resolve list styles once instead of a by-name lookup per paragraph
+        bullet_style = doc.styles['List Bullet']
+        number_style = doc.styles['List Number']
+
         # Set document properties
         doc.core_properties.title = config['title']
         doc.core_properties.author = config.get('author', 'ReportAI')
-        doc.core_properties.created = datetime.now()
+        doc.core_properties.created = now
         
         # Title
         title = doc.add_heading(config['title'], 0)
@@ -234,69 +358,87 @@ class ReportGenerator:
         doc.add_paragraph(f"Date: {config['date']}")
         doc.add_paragraph(f"Company: {config.get('company', 'N/A')}")
         doc.add_paragraph(f"Author: {config.get('author', 'N/A')}")
-        doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        doc.add_paragraph()
-        
+        # Section gaps come from space_after on the last paragraph rather
+        # than empty spacer paragraphs, which bloat the XML body
+        generated = doc.add_paragraph(f"Generated: {now.strftime('%Y-%m-%d %H:%M')}")
+        generated.paragraph_format.space_after = Pt(12)
+
         # Executive Summary
         analysis = config.get('analysis', {})
-        
+
         doc.add_heading('Executive Summary', 1)
-        doc.add_paragraph(analysis.get('executive_summary', 'No summary available'))
-        doc.add_paragraph()
-        
+        summary = doc.add_paragraph(analysis.get('executive_summary', 'No summary available'))
+        summary.paragraph_format.space_after = Pt(12)
+
         # Key Findings
         doc.add_heading('Key Findings', 1)
         findings = analysis.get('key_findings', [])
         for finding in findings:
-            doc.add_paragraph(finding, style='List Bullet')
-        doc.add_paragraph()
-        
+            item = doc.add_paragraph(finding, style=bullet_style)
+        if findings:
+            item.paragraph_format.space_after = Pt(12)
+
         # Statistical Analysis
         doc.add_heading('Statistical Analysis', 1)
-        doc.add_paragraph(analysis.get('statistical_analysis', 'No statistical analysis available'))
-        doc.add_paragraph()
-        
+        stat_lines = self._stat_lines(analysis.get('statistical_analysis', 'No statistical analysis available'))
+        for line in stat_lines:
+            stat_paragraph = doc.add_paragraph(line)
+        if stat_lines:
+            stat_paragraph.paragraph_format.space_after = Pt(12)
+
         # Data Summary
         doc.add_heading('Data Summary', 1)
         
         # Add table with data sample
         sample_data = data.head(10)
-        table = doc.add_table(rows=len(sample_data)+1, cols=min(len(sample_data.columns), 6))
+
+        # Stringify the rendered window in one vectorized pandas pass
+        # instead of calling str() per cell inside the fill loop
+        sample_arr = sample_data.iloc[:, :6].astype(str).to_numpy()
+        header = [str(col) for col in sample_data.columns[:6]]
+
+        table = doc.add_table(rows=len(sample_arr) + 1, cols=len(header))
         table.style = 'Light Grid Accent 1'
-        
+
+        # Snapshot every row's cells once up front; .rows and .cells
+        # walk the XML tree on each access, which turns indexed
+        # lookups inside the loop into O(N^2)
+        all_rows = [r.cells for r in table.rows]
+
         # Header row
-        hdr_cells = table.rows[0].cells
-        for i, col in enumerate(sample_data.columns[:6]):
-            hdr_cells[i].text = str(col)
-        
+        hdr_cells = all_rows[0]
+        for i, col in enumerate(header):
+            hdr_cells[i].text = col
+
         # Data rows
-        for i, row in enumerate(sample_data.values):
-            row_cells = table.rows[i+1].cells
-            for j, value in enumerate(row[:6]):
-                row_cells[j].text = str(value)
-        
-        doc.add_paragraph()
+        for i in range(sample_arr.shape[0]):
+            row_cells = all_rows[i + 1]
+            for j in range(sample_arr.shape[1]):
+                row_cells[j].text = sample_arr[i, j]
         
         # Recommendations
         doc.add_page_break()
         doc.add_heading('Recommendations', 1)
         recommendations = analysis.get('recommendations', [])
         for rec in recommendations:
-            doc.add_paragraph(rec, style='List Number')
-        doc.add_paragraph()
-        
+            item = doc.add_paragraph(rec, style=number_style)
+        if recommendations:
+            item.paragraph_format.space_after = Pt(12)
+
         # Conclusion
         doc.add_heading('Conclusion', 1)
-        doc.add_paragraph(analysis.get('conclusion', 'No conclusion available'))
-        
+        conclusion = doc.add_paragraph(analysis.get('conclusion', 'No conclusion available'))
+        conclusion.paragraph_format.space_after = Pt(12)
+
         # Footer
-        doc.add_paragraph()
-        footer = doc.add_paragraph(f"Generated by ReportAI - {datetime.now().strftime('%Y-%m-%d')}")
+        footer = doc.add_paragraph(f"Generated by ReportAI - {now.strftime('%Y-%m-%d')}")
         footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        # Save
-        doc.save(str(output_path))
-    
+        # Save via an in-memory buffer, single write to disk
+        buf = io.BytesIO()
+        doc.save(buf)
+        output_path.write_bytes(buf.getvalue())
+
     def _generate_excel(
         self, 
         data: pd.DataFrame, 
@@ -305,53 +447,68 @@ class ReportGenerator:
         output_path: Path
     ):
         """Generate Excel report with original data + analysis"""
-        
-        # Create new workbook
-        wb = openpyxl.Workbook()
-        
+
+        if workbook is not None:
+            # Reuse the caller's already-loaded workbook so its other
+            # sheets carry over into the report without a second parse;
+            # drop any stale report sheets from a previous run first
+            wb = workbook
+            for name in ("Summary", "Data"):
+                if name in wb.sheetnames:
+                    del wb[name]
+        else:
+            # Write-only mode streams rows straight to disk without
+            # building the full per-cell object graph in memory
+            wb = openpyxl.Workbook(write_only=True)
+
         # Summary sheet
-        ws_summary = wb.active
-        ws_summary.title = "Summary"
-        
+        ws_summary = wb.create_sheet("Summary")
+        analysis = config.get('analysis', {})
+
         # Write metadata
-        ws_summary['A1'] = config['title']
-        ws_summary['A1'].font = openpyxl.styles.Font(size=18, bold=True)
-        
-        ws_summary['A3'] = 'Date:'
-        ws_summary['B3'] = config['date']
-        ws_summary['A4'] = 'Company:'
-        ws_summary['B4'] = config.get('company', 'N/A')
-        ws_summary['A5'] = 'Author:'
-        ws_summary['B5'] = config.get('author', 'N/A')
-        
+        title_cell = WriteOnlyCell(ws_summary, value=config['title'])
+        title_cell.font = _TITLE_FONT
+        ws_summary.append([title_cell])
+        ws_summary.append([])
+        ws_summary.append(['Date:', config['date']])
+        ws_summary.append(['Company:', config.get('company', 'N/A')])
+        ws_summary.append(['Author:', config.get('author', 'N/A')])
+        ws_summary.append([])
+
         # Analysis
-        analysis = config.get('analysis', {})
-        
-        ws_summary['A7'] = 'Executive Summary'
-        ws_summary['A7'].font = openpyxl.styles.Font(size=14, bold=True)
-        ws_summary['A8'] = analysis.get('executive_summary', '')
-        ws_summary['A8'].alignment = openpyxl.styles.Alignment(wrap_text=True)
-        
+        summary_header = WriteOnlyCell(ws_summary, value='Executive Summary')
+        summary_header.font = _SECTION_FONT
+        ws_summary.append([summary_header])
+        summary_cell = WriteOnlyCell(ws_summary, value=analysis.get('executive_summary', ''))
+        summary_cell.alignment = _WRAP_ALIGNMENT
+        ws_summary.append([summary_cell])
+        ws_summary.append([])
+
         # Key Findings
-        ws_summary['A10'] = 'Key Findings'
-        ws_summary['A10'].font = openpyxl.styles.Font(size=14, bold=True)
-        findings = analysis.get('key_findings', [])
-        for i, finding in enumerate(findings, 11):
-            ws_summary[f'A{i}'] = f"• {finding}"
-        
-        # Data sheet
+        findings_header = WriteOnlyCell(ws_summary, value='Key Findings')
+        findings_header.font = _SECTION_FONT
+        ws_summary.append([findings_header])
+        for finding in analysis.get('key_findings', []):
+            ws_summary.append([f"• {finding}"])
+
+        # Normalize NaN/NaT to None in one vectorized pass, outside the
+        # write loop, so openpyxl never sees values it can't serialize
+        data = data.astype(object).where(data.notna(), None)
+
+        # Data sheet: styled header row, then streamed row appends
         ws_data = wb.create_sheet("Data")
-        
-        # Write DataFrame to Excel
-        for r_idx, row in enumerate(data.itertuples(index=False), 1):
-            for c_idx, value in enumerate(row, 1):
-                ws_data.cell(row=r_idx+1, column=c_idx, value=value)
-        
-        # Write headers
-        for c_idx, col_name in enumerate(data.columns, 1):
-            cell = ws_data.cell(row=1, column=c_idx, value=col_name)
-            cell.font = openpyxl.styles.Font(bold=True)
-            cell.fill = openpyxl.styles.PatternFill(start_color="00FF88", end_color="00FF88", fill_type="solid")
-        
+
+        header = []
+        for col_name in data.columns:
+            cell = WriteOnlyCell(ws_data, value=col_name)
+            cell.font = _HEADER_FONT
+            cell.fill = _HEADER_FILL
+            header.append(cell)
+        ws_data.append(header)
+
+        # Write DataFrame rows in bulk, one append per row
+        for row in data.itertuples(index=False, name=None):
+            ws_data.append(row)
+
         # Save workbook
         wb.save(str(output_path))